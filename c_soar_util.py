@@ -33,6 +33,11 @@ LIGHTS = [red_light, blue_light, green_light,
           purple_light, teal_light, white_light,
           off_light]
 LIGHTS_DICT = dict(zip(COLORS, LIGHTS))
+BACKPACK_LIGHTS_DICT = {"red": red_light,
+                        "green": green_light,
+                        "blue": blue_light,
+                        "white": white_light,
+                        "off": off_light}
 
 RED_STR = "\u001b[31m" if sys.platform != "win32" else ""
 GREEN_STR = "\u001b[32m" if sys.platform != "win32" else ""
@@ -104,6 +109,35 @@ def custom_object_type_factory(type, name):
     CUSTOM_OBJECT_NUM += 1
     return cozmo_obj_type
 
+def flatten_input_tree(input_tree, root_name=None):
+    """
+    Flatten a tree of input getters into lists of its branches and leaves.
+
+    The input tree is a dict mapping attribute names to either a getter function (a leaf) or
+    another input tree (a branch). Flattening it once up front lets callers update working memory
+    with a single pass over the leaves instead of recursing through the tree every input phase.
+    Branches are listed parents-first, so creating them in order always finds the parent.
+
+    :param input_tree: A dict mapping attributes to getter functions or further sub-trees
+    :param root_name: The dotted name of the tree's root, or None for the top level
+    :return: A (branches, leaves) tuple, where each branch is a (parent, attribute, name) tuple and
+             each leaf is a (parent, attribute, name, getter) tuple. `parent` is the dotted name
+             of the enclosing branch, or `root_name` for top-level entries
+    """
+    branches = []
+    leaves = []
+    for input_name, getter in input_tree.items():
+        wme_name = input_name if root_name is None else root_name + "." + input_name
+        if callable(getter):
+            leaves.append((root_name, input_name, wme_name, getter))
+        else:
+            branches.append((root_name, input_name, wme_name))
+            sub_branches, sub_leaves = flatten_input_tree(getter, wme_name)
+            branches.extend(sub_branches)
+            leaves.extend(sub_leaves)
+    return branches, leaves
+
+
 def obj_distance_factory(obj1, obj2):
     """
     Create a function which calculates the x-y distance between the poses of the two objects.
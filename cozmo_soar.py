@@ -1,3 +1,10 @@
+import logging
+import os
+import queue
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from operator import attrgetter
 from time import sleep, time
 import xml.etree.ElementTree as ET
 
@@ -7,7 +14,43 @@ import soar.Python_sml_ClientInterface as sml
 import cozmo
 from cozmo.util import degrees, distance_mm, speed_mmps
 
-from c_soar_util import *
+from c_soar_util import (BACKPACK_LIGHTS_DICT, LIGHTS_DICT, LIGHT_CUBE_NAMES, MARKER_DICT,
+                         custom_object_type_factory, flatten_input_tree)
+
+log = logging.getLogger(__name__)
+
+# FACE_INPUTS maps each attribute of a face sub-tree on the input link to a getter which takes
+#   the Cozmo face itself, so one tree serves every face without building closures per face.
+#   It is flattened once for each face designation, when the face is first seen
+FACE_INPUTS = {
+    "expression": attrgetter("expression"),
+    "exp-score": attrgetter("expression_score"),
+    "face-id": attrgetter("face_id"),
+    "name": lambda face: face.name if face.name != "" else "unknown",
+    "pose": {
+        "rot": attrgetter("pose.rotation.angle_z.degrees"),
+        "x": attrgetter("pose.position.x"),
+        "y": attrgetter("pose.position.y"),
+        "z": attrgetter("pose.position.z"),
+    }
+}
+
+# OBJECT_INPUTS maps each attribute of an object sub-tree on the input link which can change
+#   while the object is in view to a getter which takes the Cozmo object itself
+OBJECT_INPUTS = {
+    "pose": {
+        "rot": attrgetter("pose.rotation.angle_z.degrees"),
+        "x": attrgetter("pose.position.x"),
+        "y": attrgetter("pose.position.y"),
+        "z": attrgetter("pose.position.z"),
+    }
+}
+
+# A leaf of a flattened input tree, paired with the WME that holds its value in working memory
+InputSlot = namedtuple("InputSlot", ["getter", "wme"])
+
+# A command Cozmo is carrying out, along with its status WME and the command's root identifier
+RunningAction = namedtuple("RunningAction", ["action", "status_wme", "root_id"])
 
 
 class CozmoSoar(psl.AgentConnector):
@@ -42,46 +85,79 @@ class CozmoSoar(psl.AgentConnector):
         self.cam.image_stream_enabled = True
         self.r.enable_facial_expression_estimation()
 
+        # self.objects and self.faces map the ids of the objects and faces currently in view to
+        #   their Cozmo objects
         self.objects = {}
         self.faces = {}
-        self.actions = []
+        # self.actions maps the time tag of each running command's root identifier to its
+        #   `RunningAction`
+        self.actions = {}
 
         #######################
         # Working Memory data #
         #######################
 
-        # self.static_inputs maps each static input to a function to retrieve its latest value from
-        #   Soar. A static input is one that won't ever disappear, in contrast to temporary inputs
-        #   like faces or objects
+        # self.static_inputs maps each static input to a function which takes the robot and
+        #   retrieves the input's latest value. A static input is one that won't ever disappear, in
+        #   contrast to temporary inputs like faces or objects. Plain attribute chains use
+        #   `attrgetter`, which walks the chain without calling back into Python
         self.static_inputs = {
-            "battery-voltage": lambda: self.r.battery_voltage,
-            "carrying-block": lambda: int(self.r.is_carrying_block),
-            "carrying-object-id": lambda: self.r.carrying_object_id,
-            "charging": lambda: int(self.r.is_charging),
-            "cliff-detected": lambda: int(self.r.is_cliff_detected),
-            "head-angle": lambda: self.r.head_angle.degrees,
-            "face-count": self.w.visible_face_count,
-            "object-count": lambda: len(self.objects),
-            "picked-up": lambda: int(self.r.is_picked_up),
-            "robot-id": lambda: self.r.robot_id,
-            "serial": lambda: self.r.serial,
+            "battery-voltage": attrgetter("battery_voltage"),
+            "carrying-block": lambda robot: 1 if robot.is_carrying_block else 0,
+            "carrying-object-id": attrgetter("carrying_object_id"),
+            "charging": lambda robot: 1 if robot.is_charging else 0,
+            "cliff-detected": lambda robot: 1 if robot.is_cliff_detected else 0,
+            "head-angle": attrgetter("head_angle.degrees"),
+            "face-count": lambda robot: robot.world.visible_face_count(),
+            "object-count": lambda robot: len(self.objects),
+            "picked-up": lambda robot: 1 if robot.is_picked_up else 0,
             "pose": {
-                "rot": lambda: self.r.pose.rotation.angle_z.degrees,
-                "x": lambda: self.r.pose.position.x,
-                "y": lambda: self.r.pose.position.y,
-                "z": lambda: self.r.pose.position.z,
+                "rot": attrgetter("pose.rotation.angle_z.degrees"),
+                "x": attrgetter("pose.position.x"),
+                "y": attrgetter("pose.position.y"),
+                "z": attrgetter("pose.position.z"),
             },
             "lift": {
-                "angle": lambda: self.r.lift_angle.degrees,
-                "height": lambda: self.r.lift_height.distance_mm,
-                "ratio": lambda: self.r.lift_ratio,
+                "angle": attrgetter("lift_angle.degrees"),
+                "height": attrgetter("lift_height.distance_mm"),
+                "ratio": attrgetter("lift_ratio"),
             },
         }
+        # The shape of the static input tree never changes, so it is flattened once here rather
+        #   than walked recursively every input phase
+        self.static_branches, self.static_leaves = flatten_input_tree(self.static_inputs)
+        # self.fixed_inputs holds the static inputs which never change for a given robot, so
+        #   they're added to working memory once and never updated
+        self.fixed_inputs = {
+            "robot-id": self.r.robot_id,
+            "serial": self.r.serial,
+        }
+        # self.static_slots holds an `InputSlot` for each static leaf once the first input phase
+        #   has added them to working memory
+        self.static_slots = None
 
         # self.WMEs maps SoarWME objects to their attribute names for easier retrieval. Since Cozmo
         #   inputs will always be one-to-one with their values (i.e., there won't be multiple values
         #   with the same name), a standard dictionary is fine
         self.WMEs = {}
+        # self.wme_subtrees maps the root of each sub-tree of WMEs (e.g., a face or object
+        #   designation) to the names of all the WMEs in that sub-tree, in the order they were
+        #   created. Removing them in reverse order always removes children before their parents
+        self.wme_subtrees = {}
+        # self.face_slots and self.object_slots map the ids of the faces and objects in view to
+        #   the `InputSlot`s of their leaves, so updating them every input phase needs neither
+        #   designation strings, dotted names, nor WME lookups
+        self.face_slots = {}
+        self.object_slots = {}
+        # self.cube_inputs extends OBJECT_INPUTS with the inputs only light cubes have. Tap times
+        #   are given relative to when this connector was created
+        self.cube_inputs = dict(OBJECT_INPUTS)
+        self.cube_inputs.update({
+            "connected": attrgetter("is_connected"),
+            "moving": attrgetter("is_moving"),
+            "last-tapped": lambda cube: cube.last_tapped_time - self.start_time
+                                        if cube.last_tapped_time is not None else -1.0,
+        })
 
         ###############################
         # Command Handling dictionary #
@@ -106,24 +182,47 @@ class CozmoSoar(psl.AgentConnector):
         Handle commands Soar outputs by initiating the appropriate Soar action.
 
         Currently, all this does is use a dictionary mapping from the command name to the
-        appropriate handling function.
+        appropriate handling function. A command which is already running (i.e., one whose
+        root identifier is already being tracked) is not started a second time.
 
         :param command_name: Name of the command being issued
         :param root_id: sml Identifier object containing the command
         :return: None
         """
-        print(
-            "!!! A: ",
-            command_name,
-            [root_id.GetChild(c) for c in range(root_id.GetNumberChildren())],
-        )
-        results = self.command_map[command_name](root_id)
+        action_key = root_id.GetTimeTag()
+        if action_key in self.actions:
+            return
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "Received command %s %s",
+                command_name,
+                [root_id.GetChild(c) for c in range(root_id.GetNumberChildren())],
+            )
+        handler = self.command_map.get(command_name)
+        if handler is None:
+            log.warning("No handler for command %s", command_name)
+            return
+
+        results = handler(root_id)
         if not results:
-            print("Error execcuting command")
+            log.debug("Error executing command %s", command_name)
         else:
             action, status_wme = results
-            # print(action)
-            self.actions.append((action, status_wme, root_id))
+            if action is not None:
+                self.actions[action_key] = RunningAction(action, status_wme, root_id)
+
+    def __start_action(self, command: sml.Identifier, action):
+        """
+        Mark a command as running by adding a `status` WME to it.
+
+        :param command: Soar command object
+        :param action: The Cozmo action carrying out the command
+        :return: The (action, status WME) pair `on_output_event` expects from a handler
+        """
+        status_wme = psl.SoarWME("status", "running")
+        status_wme.add_to_wm(command)
+        return action, status_wme
 
     def __handle_place_object_down(self, command: sml.Identifier):
         """
@@ -136,13 +235,9 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
-        print("Placing object down")
+        log.debug("Placing object down")
         place_object_down_action = self.r.place_object_on_ground_here(0, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return place_object_down_action, status_wme
+        return self.__start_action(command, place_object_down_action)
 
     def __handle_place_on_object(self, command: sml.Identifier):
         """
@@ -157,30 +252,21 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        id_str = command.GetParameterValue("object-id")
         try:
-            target_id = int(command.GetParameterValue("object-id"))
+            target_id = int(id_str)
         except ValueError as e:
-            print(
-                "Invalid object-id format {}".format(
-                    command.GetParameterValue("object-id")
-                )
-            )
+            log.warning("Invalid object-id format %s", id_str)
             return False
 
-        target_dsg = "obj{}".format(target_id)
-        if target_dsg not in self.objects.keys():
-            print("Couldn't find target object")
-            print(self.objects)
+        if target_id not in self.objects:
+            log.warning("Couldn't find target object %s among %s", target_id, list(self.objects))
             return False
 
-        print("Placing held object on top of {}".format(target_dsg))
-        target_obj = self.objects[target_dsg]
+        log.debug("Placing held object on top of object %s", target_id)
+        target_obj = self.objects[target_id]
         place_on_object_action = self.robot.place_on_object(target_obj, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return place_on_object_action, status_wme
+        return self.__start_action(command, place_on_object_action)
 
     def __handle_dock_with_cube(self, command: sml.Identifier):
         """
@@ -195,26 +281,20 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        id_str = command.GetParameterValue("object-id")
         try:
-            target_id = int(command.GetParameterValue("object-id"))
-            target_id = "obj{}".format(target_id)
+            target_id = int(id_str)
         except ValueError as e:
-            print(
-                "Invalid target-object-id format {}".format(command.GetParameterValue("object-id"))
-            )
+            log.warning("Invalid target-object-id format %s", id_str)
             return False
-        if target_id not in self.objects.keys():
-            print("Couldn't find target object")
+        if target_id not in self.objects:
+            log.warning("Couldn't find target object")
             return False
 
-        print("Docking with cube with object id {}".format(target_id))
+        log.debug("Docking with cube with object id %s", target_id)
         target_obj = self.objects[target_id]
         dock_with_cube_action = self.robot.dock_with_cube(target_obj, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return dock_with_cube_action, status_wme
+        return self.__start_action(command, dock_with_cube_action)
 
     def __handle_pick_up_object(self, command: sml.Identifier):
         """
@@ -230,25 +310,21 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        id_str = command.GetParameterValue("object-id")
         try:
-            target_id = int(command.GetParameterValue("object-id"))
+            target_id = int(id_str)
         except ValueError as e:
-            print("Invalid object-id format {}".format(command.GetParameterValue("object-id")))
+            log.warning("Invalid object-id format %s", id_str)
             return False
 
-        obj_designation = "obj{}".format(target_id)
-        if not self.objects.get(obj_designation):
-            print("Couldn't find target object")
+        if target_id not in self.objects:
+            log.warning("Couldn't find target object")
             return False
 
-        print("Picking up object {}".format(obj_designation))
-        target_obj = self.objects[obj_designation]
+        log.debug("Picking up object %s", target_id)
+        target_obj = self.objects[target_id]
         pick_up_object_action = self.robot.pickup_object(target_obj, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return pick_up_object_action, status_wme
+        return self.__start_action(command, pick_up_object_action)
 
     def __handle_turn_to_face(self, command: sml.Identifier):
         """
@@ -262,23 +338,20 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        face_id_str = command.GetParameterValue("face-id")
         try:
-            fid = int(command.GetParameterValue("face-id"))
+            fid = int(face_id_str)
         except ValueError as e:
-            print("Invalid face id format {}".format(command.GetParameterValue("face-id")))
+            log.warning("Invalid face id format %s", face_id_str)
             return False
-        if fid not in self.faces.keys():
-            print("Face {} not recognized".format(fid))
+        if fid not in self.faces:
+            log.warning("Face %s not recognized", fid)
             return False
 
-        print("Turning to face {}".format(fid))
+        log.debug("Turning to face %s", fid)
         target_face = self.faces[fid]
         turn_towards_face_action = self.r.turn_towards_face(target_face, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return turn_towards_face_action, status_wme
+        return self.__start_action(command, turn_towards_face_action)
 
     def __handle_move_lift(self, command: sml.Identifier):
         """
@@ -293,19 +366,16 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        height_str = command.GetParameterValue("height")
         try:
-            height = float(command.GetParameterValue("height"))
+            height = float(height_str)
         except ValueError as e:
-            print("Invalid height format {}".format(command.GetParameterValue("height")))
+            log.warning("Invalid height format %s", height_str)
             return False
 
-        print("Moving lift {}".format(height))
+        log.debug("Moving lift %s", height)
         set_lift_height_action = self.robot.set_lift_height(height, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return set_lift_height_action, status_wme
+        return self.__start_action(command, set_lift_height_action)
 
     def __handle_move_head(self, command: sml.Identifier):
         """
@@ -321,19 +391,16 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        angle_str = command.GetParameterValue("angle")
         try:
-            angle = float(command.GetParameterValue("angle"))
+            angle = float(angle_str)
         except ValueError as e:
-            print("Invalid angle format {}".format(command.GetParameterValue("angle")))
+            log.warning("Invalid angle format %s", angle_str)
             return False
 
-        print("Moving head {}".format(angle))
+        log.debug("Moving head %s", angle)
         set_head_angle_action = self.robot.set_head_angle(degrees(angle), in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return set_head_angle_action, status_wme
+        return self.__start_action(command, set_head_angle_action)
 
     def __handle_go_to_object(self, command: sml.Identifier):
         """
@@ -349,34 +416,27 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        id_str = command.GetParameterValue("object-id")
         try:
-            target_id = int(command.GetParameterValue("object-id"))
-            target_id = f"obj{target_id}"
+            target_id = int(id_str)
         except ValueError as e:
-            print(
-                "Invalid target-object-id format {}".format(
-                    command.GetParameterValue("object-id")
-                )
-            )
+            log.warning("Invalid target-object-id format %s", id_str)
             return False
-        if target_id not in self.objects.keys():
-            print("Couldn't find target object")
+        if target_id not in self.objects:
+            log.warning("Couldn't find target object")
             return False
 
+        distance_str = command.GetParameterValue("distance")
         try:
-            distance = distance_mm(float(command.GetParameterValue("distance")))
+            distance = distance_mm(float(distance_str))
         except ValueError as e:
-            print("Invalid distance format {}".format(command.GetParameterValue("distance")))
+            log.warning("Invalid distance format %s", distance_str)
             return False
 
-        print("Going to object {}".format(target_id))
+        log.debug("Going to object %s", target_id)
         target_obj = self.objects[target_id]
         go_to_object_action = self.robot.go_to_object(target_obj, distance, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return go_to_object_action, status_wme
+        return self.__start_action(command, go_to_object_action)
 
     def __handle_set_backpack_lights(self, command: sml.Identifier):
         """
@@ -392,19 +452,10 @@ class CozmoSoar(psl.AgentConnector):
         :return: True if successful, False otherwise
         """
         color_str = command.GetParameterValue("color")
-        if color_str not in COLORS:
-            print("Invalid backpack lights color {}".format(color_str))
+        light = BACKPACK_LIGHTS_DICT.get(color_str)
+        if light is None:
+            log.warning("Invalid backpack lights color %s", color_str)
             return False
-        elif color_str == "red":
-            light = cozmo.lights.red_light
-        elif color_str == "green":
-            light = cozmo.lights.green_light
-        elif color_str == "blue":
-            light = cozmo.lights.blue_light
-        elif color_str == "white":
-            light = cozmo.lights.white_light
-        else:
-            light = cozmo.lights.off_light
 
         self.r.set_all_backpack_lights(light=light)
         command.AddStatusComplete()
@@ -424,24 +475,22 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        distance_str = command.GetParameterValue("distance")
         try:
-            distance = distance_mm(float(command.GetParameterValue("distance")))
+            distance = distance_mm(float(distance_str))
         except ValueError as e:
-            print("Invalid distance format {}".format(command.GetParameterValue("distance")))
+            log.warning("Invalid distance format %s", distance_str)
             return False
+        speed_str = command.GetParameterValue("speed")
         try:
-            speed = speed_mmps(float(command.GetParameterValue("speed")))
+            speed = speed_mmps(float(speed_str))
         except ValueError as e:
-            print("Invalid speed format {}".format(command.GetParameterValue("speed")))
+            log.warning("Invalid speed format %s", speed_str)
             return False
 
-        print("Driving forward {}mm at {}mm/s".format(distance.distance_mm, speed.speed_mmps))
+        log.debug("Driving forward %smm at %smm/s", distance.distance_mm, speed.speed_mmps)
         drive_forward_action = self.r.drive_straight(distance, speed, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return drive_forward_action, status_wme
+        return self.__start_action(command, drive_forward_action)
 
     def __handle_turn_in_place(self, command: sml.Identifier):
         """
@@ -457,24 +506,22 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        angle_str = command.GetParameterValue("angle")
         try:
-            angle = degrees(float(command.GetParameterValue("angle")))
+            angle = degrees(float(angle_str))
         except ValueError as e:
-            print("Invalid angle format {}".format(command.GetParameterValue("angle")))
+            log.warning("Invalid angle format %s", angle_str)
             return False
+        speed_str = command.GetParameterValue("speed")
         try:
-            speed = degrees(float(command.GetParameterValue("speed")))
+            speed = degrees(float(speed_str))
         except ValueError as e:
-            print("Invalid speed format {}".format(command.GetParameterValue("speed")))
+            log.warning("Invalid speed format %s", speed_str)
             return False
 
-        print("Rotating in place {} degrees at {}deg/s".format(angle.degrees, speed.degrees))
+        log.debug("Rotating in place %s degrees at %sdeg/s", angle.degrees, speed.degrees)
         turn_in_place_action = self.r.turn_in_place(angle=angle, speed=speed, in_parallel=True)
-        status_wme = psl.SoarWME("status", "running")
-        status_wme.add_to_wm(command)
-        status_wme.update_wm()
-
-        return turn_in_place_action, status_wme
+        return self.__start_action(command, turn_in_place_action)
 
     def __handle_change_block_color(self, command: sml.Identifier):
         """
@@ -490,37 +537,37 @@ class CozmoSoar(psl.AgentConnector):
         :param command: Soar command object
         :return: True if successful, False otherwise
         """
+        id_str = command.GetParameterValue("object-id")
         try:
-            target_id = int(command.GetParameterValue("object-id"))
+            target_id = int(id_str)
         except ValueError as e:
             #TODO: Update action WME to have failure codes
-            print("Invalid object-id format, must be int")
+            log.warning("Invalid object-id format, must be int")
             return False
-        if f"obj{target_id}" not in self.objects.keys():
+        if target_id not in self.objects:
             #TODO: Update action WME to have failure codes
-            print(f"Invalid object-id {target_id}, can't find it")
+            log.warning("Invalid object-id %s, can't find it", target_id)
             return False
 
         color = command.GetParameterValue("color").lower()
-        if color not in COLORS:
-            print(f"Invalid color choice: {color}")
+        light = LIGHTS_DICT.get(color)
+        if light is None:
+            log.warning("Invalid color choice: %s", color)
             status_wme = psl.SoarWME("status", "failed")
             fail_code_wme = psl.SoarWME("failure-code", "invalid-color")
             fail_reason_wme = psl.SoarWME("failure-reason", "invalid-color: {}".format(color))
             status_wme.add_to_wm(command)
             fail_code_wme.add_to_wm(command)
             fail_reason_wme.add_to_wm(command)
-            status_wme.update_wm()
             return False
 
-        print(f"Changing object {target_id} to color {color}")
-        target_block = self.objects[f"obj{target_id}"]
-        print("Target object: {}".format(target_block.cube_id))
+        log.debug("Changing object %s to color %s", target_id, color)
+        target_block = self.objects[target_id]
+        log.debug("Target object: %s", target_block.cube_id)
         target_block.set_lights_off()
-        target_block.set_lights(LIGHTS_DICT[color])
+        target_block.set_lights(light)
         status_wme = psl.SoarWME("status", "complete")
         status_wme.add_to_wm(command)
-        status_wme.update_wm()
         return (None, None)
 
     def on_input_phase(self, input_link: sml.Identifier):
@@ -528,12 +575,10 @@ class CozmoSoar(psl.AgentConnector):
         Prior to each input phase, update the changed values of Soar's input link
 
         Scan through the designated Cozmo inputs and update the corresponding WMEs in Soar via
-        instances of the `SoarWME` class. For each input, we first get the value, then check
-        whether there exists a WME with that attribute name. If not, we add one to the Soar agent
-        and the WME dict of the `CozmoSoar` object. Otherwise, we retrieve the `SoarWME` object
-        associated with the input and update its value, then call its `update_wm` method. For
-        terminal WMEs, this is simple. However, for sub-trees we need to recursively update
-        the WMEs.
+        instances of the `SoarWME` class. The first time an input tree is seen, its WMEs are added
+        to the Soar agent and the WME dict of the `CozmoSoar` object, and each leaf is paired with
+        its `SoarWME` in an `InputSlot`. After that, we just walk the slots, updating each WME's
+        value and calling its `update_wm` method.
 
         We have to handle temporary inputs e.g., faces or objects, differently, because they
         need to be removed when they are no longer detected.
@@ -541,242 +586,221 @@ class CozmoSoar(psl.AgentConnector):
         :param input_link: The Soar WME corresponding to the input link of the agent.
         :return: None
         """
-        # First, we handle inputs which will always be present
-        for input_name in self.static_inputs.keys():
-            new_val = self.static_inputs[input_name]
-            wme = self.WMEs.get(input_name)
-
-            if not callable(new_val):
-                if wme is None:
-                    wme = input_link.CreateIdWME(input_name)
-                    self.WMEs[input_name] = wme
-                self.__input_recurse(new_val, input_name, wme)
-                continue
+        # The SDK's event loop adds to the world's faces and objects from its own thread, so the
+        #   visible ones are copied before any working memory is touched
+        faces = list(self.w.visible_faces)
+        objects = list(self.w.visible_objects)
 
-            new_val = new_val()
-            if wme is None:
-                new_wme = psl.SoarWME(att=input_name, val=new_val)
-                self.WMEs[input_name] = new_wme
-                new_wme.add_to_wm(input_link)
-            else:
-                wme.set_value(new_val)
-                wme.update_wm()
+        # First, we handle inputs which will always be present
+        if self.static_slots is None:
+            for input_name, value in self.fixed_inputs.items():
+                wme = psl.SoarWME(input_name, value)
+                wme.add_to_wm(input_link)
+                self.__store_wme(input_name, wme)
+            self.static_slots = self.__add_flat_inputs(self.static_branches, self.static_leaves,
+                                                       input_link, self.r)
+        else:
+            self.__update_input_slots(self.static_slots, self.r)
 
         # Then, check through the visible faces and objects to see if they need to be added,
         # updated, or removed
         #######################
         # FACE INPUT HANDLING #
         #######################
-        vis_faces = set(list(self.w.visible_faces))
-        for face in vis_faces:
-            face_designation = "face{}".format(face.face_id)
-            if face_designation in self.faces:
-                face_wme = self.WMEs[face_designation]
+        vis_face_ids = {face.face_id for face in faces}
+        for face in faces:
+            face_id = face.face_id
+            if face_id in self.faces:
+                self.__update_input_slots(self.face_slots[face_id], face)
             else:
-                self.faces[face_designation] = face
+                self.faces[face_id] = face
+                face_designation = "face{}".format(face_id)
                 face_wme = input_link.CreateIdWME("face")
-                self.WMEs[face_designation] = face_wme
-            self.__build_face_wme_subtree(face, face_designation, face_wme)
-
-        faces_missing = set()
-        for face_dsg in self.faces.keys():
-            if self.faces[face_dsg] not in vis_faces:
-                faces_missing.add(face_dsg)
-        for face_dsg in faces_missing:
-            del self.faces[face_dsg]
-            remove_list = [(n, self.WMEs[n]) for n in self.WMEs.keys() if n.startswith(face_dsg)]
-            remove_list = sorted(remove_list, key=lambda s: 1/len(s[0]))
-            for wme_name, wme in remove_list:
-                del self.WMEs[wme_name]
-                if isinstance(wme, psl.SoarWME):
-                    wme.remove_from_wm()
-                elif isinstance(wme, sml.Identifier):
-                    wme.DestroyWME()
-                else:
-                    raise Exception("WME wasn't of proper type")
+                self.__store_wme(face_designation, face_wme)
+                self.__build_face_wme_subtree(face, face_designation, face_wme)
+
+        for face_id in self.faces.keys() - vis_face_ids:
+            del self.faces[face_id]
+            del self.face_slots[face_id]
+            self.__remove_wme_subtree("face{}".format(face_id))
 
         #########################
         # OBJECT INPUT HANDLING #
         #########################
-        vis_objs = set(list(self.w.visible_objects))
-        for obj in vis_objs:
-            obj_designation = "obj{}".format(obj.object_id)
-            if obj_designation in self.objects:
-                obj_wme = self.WMEs[obj_designation]
+        vis_obj_ids = {obj.object_id for obj in objects}
+        for obj in objects:
+            obj_id = obj.object_id
+            if obj_id in self.objects:
+                self.__update_input_slots(self.object_slots[obj_id], obj)
             else:
-                self.objects[obj_designation] = obj
+                self.objects[obj_id] = obj
+                obj_designation = "obj{}".format(obj_id)
                 obj_wme = input_link.CreateIdWME("object")
-                self.WMEs[obj_designation] = obj_wme
-            self.__build_obj_wme_subtree(obj, obj_designation, obj_wme)
-
-        objs_missing = set()
-        for obj_dsg in self.objects.keys():
-            if self.objects[obj_dsg] not in vis_objs:
-                objs_missing.add(obj_dsg)
-        for obj_dsg in objs_missing:
-            del self.objects[obj_dsg]
-            remove_list = [(n, self.WMEs[n]) for n in self.WMEs.keys() if n.startswith(obj_dsg)]
-            remove_list = sorted(remove_list, key=lambda s: 1/len(s[0]))
-            for wme_name, wme in remove_list:
-                del self.WMEs[wme_name]
-                if isinstance(wme, psl.SoarWME):
-                    wme.remove_from_wm()
-                elif isinstance(wme, sml.Identifier):
-                    wme.DestroyWME()
-                else:
-                    raise Exception("WME wasn't of proper type")
+                self.__store_wme(obj_designation, obj_wme)
+                self.__add_obj_fixed_wmes(obj, obj_designation, obj_wme)
+                self.__build_obj_wme_subtree(obj, obj_designation, obj_wme)
+
+        for obj_id in self.objects.keys() - vis_obj_ids:
+            del self.objects[obj_id]
+            del self.object_slots[obj_id]
+            self.__remove_wme_subtree("obj{}".format(obj_id))
 
         # Finally, we want to check all our on-going actions and handle them appropriately:
         # Actions are by default on the output link and have a `status` attribute already,
         # we just need to update that status if needed
-        for action, status_wme, root_id in self.actions:
-            if action is None and status_wme is None:
-                self.actions.remove((action, status_wme, root_id))
+        for action_key, (action, status_wme, root_id) in list(self.actions.items()):
+            if not action.is_completed:
                 continue
-            if action.is_completed:
-                state = "complete" if action.has_succeeded else "failed"
-                failure_reason = action.failure_reason
 
-                status_wme.set_value(state)
+            if action.has_succeeded:
+                status_wme.set_value("complete")
+            else:
+                status_wme.set_value("failed")
+                failure_reason = action.failure_reason
                 if failure_reason != (None, None):
                     code_wme = psl.SoarWME("failure-code", failure_reason[0])
                     reason_wme = psl.SoarWME("failure-reason", failure_reason[1])
                     code_wme.add_to_wm(root_id)
-                    code_wme.update_wm()
                     reason_wme.add_to_wm(root_id)
-                    reason_wme.update_wm()
-                status_wme.update_wm()
-                self.actions.remove((action, status_wme, root_id))
+            status_wme.update_wm()
+            del self.actions[action_key]
 
-    def __build_obj_wme_subtree(self, obj, obj_designation, obj_wme):
+    def __store_wme(self, wme_name, wme):
         """
-        Build a working memory sub-tree for a given perceived object
+        Store a newly created WME under its dotted name and record it in its root's sub-tree.
+
+        :param wme_name: The dotted name of the WME, starting with its root's designation
+        :param wme: The `SoarWME` or sml identifier to store
+        :return: None
+        """
+        self.WMEs[wme_name] = wme
+        self.wme_subtrees.setdefault(wme_name.split(".", 1)[0], []).append(wme_name)
+
+    def __remove_wme_subtree(self, designation):
+        """
+        Remove every WME in the sub-tree rooted at the given designation from working memory.
+
+        :param designation: Unique string name of the root of the sub-tree, e.g. a face or object
+        :return: None
+        """
+        for wme_name in reversed(self.wme_subtrees.pop(designation, [])):
+            wme = self.WMEs.pop(wme_name)
+            if isinstance(wme, psl.SoarWME):
+                wme.remove_from_wm()
+            elif isinstance(wme, sml.Identifier):
+                wme.DestroyWME()
+            else:
+                raise Exception("WME wasn't of proper type")
+
+    def __add_obj_fixed_wmes(self, obj, obj_designation, obj_wme):
+        """
+        Add the WMEs for the attributes of a newly perceived object which never change
+
+        An object's id, names, type, and whether it's liftable are fixed for as long as it's in
+        view, so they're added to working memory once, when the object is first seen, rather than
+        being recomputed every input phase.
 
         :param obj: Cozmo objects.ObservableObject object to put into working memory
         :param obj_designation: Unique string name of the object
         :param obj_wme: sml identifier at the root of the object sub-tree
         :return: None
         """
-        obj_input_dict = {
+        fixed_inputs = {
             "object-id": obj.object_id,
             "descriptive-name": obj.descriptive_name,
             "liftable": int(obj.pickupable),
-            "pose": {
-                "rot": lambda: obj.pose.rotation.angle_z.degrees,
-                "x": lambda: obj.pose.position.x,
-                "y": lambda: obj.pose.position.y,
-                "z": lambda: obj.pose.position.z,
-            }
         }
         if isinstance(obj, cozmo.objects.LightCube):
-            obj_input_dict["type"] = "led-cube"
-            obj_input_dict["connected"] = obj.is_connected
-            obj_input_dict["cube-id"] = obj.cube_id
-            obj_input_dict["moving"] = obj.is_moving
-            obj_input_dict["last-tapped"] = obj.last_tapped_time - self.start_time\
-                                            if obj.last_tapped_time is not None else -1.0
-            obj_input_dict["name"] = LIGHT_CUBE_NAMES[obj.cube_id]
+            fixed_inputs["type"] = "led-cube"
+            fixed_inputs["cube-id"] = obj.cube_id
+            fixed_inputs["name"] = LIGHT_CUBE_NAMES[obj.cube_id]
         elif isinstance(obj, cozmo.objects.Charger):
             #TODO: Handle seeing the charger
             pass
         else:
             cozmo_obj_type = obj.object_type
             obj_type, obj_name = cozmo_obj_type.name.split("-")
-            obj_input_dict["type"] = obj_type
-            obj_input_dict["name"] = obj_name
-
-        for input_name in obj_input_dict.keys():
-            new_val = obj_input_dict[input_name]
-            wme = self.WMEs.get(obj_designation + "." + input_name)
-
-            if isinstance(new_val, dict):
-                if wme is None:
-                    wme = obj_wme.CreateIdWME(input_name)
-                    self.WMEs[obj_designation + "." + input_name] = wme
-                self.__input_recurse(new_val, obj_designation + "." + input_name, wme)
-                continue
+            fixed_inputs["type"] = obj_type
+            fixed_inputs["name"] = obj_name
 
-            if wme is None:
-                wme = psl.SoarWME(input_name, obj_input_dict[input_name])
-                wme.add_to_wm(obj_wme)
-                self.WMEs[obj_designation + "." + input_name] = wme
-            else:
-                wme.set_value(obj_input_dict[input_name])
-                wme.update_wm()
+        for input_name, value in fixed_inputs.items():
+            wme = psl.SoarWME(input_name, value)
+            wme.add_to_wm(obj_wme)
+            self.__store_wme(obj_designation + "." + input_name, wme)
+
+    def __build_obj_wme_subtree(self, obj, obj_designation, obj_wme):
+        """
+        Build a working memory sub-tree for a newly perceived object
+
+        Only the attributes which can change while the object is in view are handled here; the
+        rest are added once by `__add_obj_fixed_wmes`. After this, the object's WMEs are kept up
+        to date through its entry in `self.object_slots`.
+
+        :param obj: Cozmo objects.ObservableObject object to put into working memory
+        :param obj_designation: Unique string name of the object
+        :param obj_wme: sml identifier at the root of the object sub-tree
+        :return: None
+        """
+        if isinstance(obj, cozmo.objects.LightCube):
+            obj_inputs = self.cube_inputs
+        else:
+            obj_inputs = OBJECT_INPUTS
+        branches, leaves = flatten_input_tree(obj_inputs, obj_designation)
+        self.object_slots[obj.object_id] = self.__add_flat_inputs(branches, leaves, obj_wme, obj)
 
     def __build_face_wme_subtree(self, face, face_designation, face_wme):
         """
-        Build a working memory sub-tree for a given perceived face
+        Build a working memory sub-tree for a newly perceived face
+
+        After this, the face's WMEs are kept up to date through its entry in `self.face_slots`.
 
         :param face: Cozmo faces.Face object to put into working memory
         :param face_designation: Unique string name of the face
         :param face_wme: sml identifier at the root of the face sub-tree
         :return: None
         """
-        face_input_dict = {
-            "expression": face.expression,
-            "exp-score": face.expression_score,
-            "face-id": face.face_id,
-            "name": face.name if face.name != "" else "unknown",
-            "pose": {
-                "rot": lambda: face.pose.rotation.angle_z.degrees,
-                "x": lambda: face.pose.position.x,
-                "y": lambda: face.pose.position.y,
-                "z": lambda: face.pose.position.z,
-            }
-        }
-        for input_name in face_input_dict.keys():
-            new_val = face_input_dict[input_name]
-            wme = self.WMEs.get(face_designation + "." + input_name)
-
-            if isinstance(new_val, dict):
-                if wme is None:
-                    wme = face_wme.CreateIdWME(input_name)
-                    self.WMEs[face_designation + "." + input_name] = wme
-                self.__input_recurse(new_val, face_designation + "." + input_name, wme)
-                continue
-
-            if wme is None:
-                wme = psl.SoarWME(input_name, face_input_dict[input_name])
-                wme.add_to_wm(face_wme)
-                self.WMEs[face_designation + "." + input_name] = wme
-            else:
-                wme.set_value(face_input_dict[input_name])
-                wme.update_wm()
+        branches, leaves = flatten_input_tree(FACE_INPUTS, face_designation)
+        self.face_slots[face.face_id] = self.__add_flat_inputs(branches, leaves, face_wme, face)
 
-    def __input_recurse(self, input_dict, root_name, root_id: sml.Identifier):
+    def __add_flat_inputs(self, branches, leaves, root_id, source):
         """
-        Recursively update WMEs that have a sub-tree structure in the input link.
+        Add the WMEs of a flattened input tree rooted at the given identifier to working memory.
 
-        We scan through the `input_dict`, which represents the input value getters (or further
-        sub-trees) of the sub-tree root, either adding terminal WMEs as usual or further recursing.
+        The branches and leaves are those returned by `flatten_input_tree`. WMEs are stored in
+        `self.WMEs` under their dotted names, which already include the designation of the tree's
+        root if it was flattened with one.
 
-        :param input_dict: A dict mapping attributes to getter functions
-        :param root_name: The attribute which is the root of this sub-tree
-        :param root_id: The sml identifier of the root of the sub-tree
-        :return: None
+        :param branches: The (parent, attribute, name) branches of the flattened tree
+        :param leaves: The (parent, attribute, name, getter) leaves of the flattened tree
+        :param root_id: The sml identifier at the root of the tree, used for entries whose parent
+                        is None
+        :param source: The robot, face, or object every leaf getter reads its value from
+        :return: A list of `InputSlot`s, one per leaf, to pass to `__update_input_slots`
         """
-        assert isinstance(input_dict, dict), "Should only recurse on dicts!"
+        for parent_name, input_name, wme_name in branches:
+            parent_id = root_id if parent_name is None else self.WMEs[parent_name]
+            self.__store_wme(wme_name, parent_id.CreateIdWME(input_name))
 
-        for input_name in input_dict.keys():
-            new_val = input_dict[input_name]
-            wme = self.WMEs.get(root_name + "." + input_name)
+        slots = []
+        for parent_name, input_name, wme_name, getter in leaves:
+            parent_id = root_id if parent_name is None else self.WMEs[parent_name]
+            wme = psl.SoarWME(att=input_name, val=getter(source))
+            self.__store_wme(wme_name, wme)
+            wme.add_to_wm(parent_id)
+            slots.append(InputSlot(getter, wme))
+        return slots
 
-            if not callable(new_val):
-                if wme is None:
-                    wme = root_id.CreateIdWME(input_name)
-                    self.WMEs[root_name + "." + input_name] = wme
-                self.__input_recurse(new_val, root_name + "." + input_name, wme)
-                continue
+    def __update_input_slots(self, slots, source):
+        """
+        Refresh the value of each WME in a list of `InputSlot`s.
 
-            new_val = new_val()
-            if wme is None:
-                new_wme = psl.SoarWME(att=input_name, val=new_val)
-                self.WMEs[root_name + "." + input_name] = new_wme
-                new_wme.add_to_wm(root_id)
-            else:
-                wme.set_value(new_val)
-                wme.update_wm()
+        :param slots: The slots returned by `__add_flat_inputs`
+        :param source: The robot, face, or object every slot's getter reads its value from
+        :return: None
+        """
+        for getter, wme in slots:
+            wme.set_value(getter(source))
+            wme.update_wm()
 
 
 class SoarObserver(psl.AgentConnector):
@@ -784,54 +808,141 @@ class SoarObserver(psl.AgentConnector):
     An `AgentConnector` subclass for viewing infromation about the Soar agent.
 
     This class just exists to handle getting information out of Soar and into a useful format.
+    Printing the state, input link, and output link walks a large part of working memory, so it
+    only happens once every `print_every` input phases, and not at all if that's 0 (the default).
+    The text itself is written by a background thread, so the input phase never waits on stdout;
+    if that thread falls behind, new snapshots are dropped rather than queued.
     """
 
-    def __init__(self, agent: psl.SoarAgent, print_handler=None):
+    STATE_CMD = "print --depth 2 s1"
+    INPUT_LINK_CMD = "print --depth 3 i2"
+    OUTPUT_LINK_CMD = "print --depth 4 i3"
+
+    def __init__(self, agent: psl.SoarAgent, print_handler=None, print_every=0):
         super(SoarObserver, self).__init__(agent, print_handler)
+        # Snapshots go to the same place as the rest of the agent's output unless a handler is
+        #   given for this observer
+        if print_handler is None:
+            print_handler = getattr(agent, "print_handler", print)
+        self.print_handler = print_handler
+        self.print_every = print_every
+        self.ticks = 0
+        self.print_queue = queue.Queue(maxsize=16)
+        # The worker thread is only started once there's something to print
+        self.print_thread = None
+
+    def __print_worker(self):
+        """Write each queued working memory snapshot to the print handler, forever."""
+        while True:
+            self.print_handler(self.print_queue.get())
+
+    def set_print_every(self, print_every):
+        """
+        Change how often working memory is printed.
+
+        :param print_every: Print once every this many input phases, or never if 0
+        :return: None
+        """
+        self.print_every = print_every
+        self.ticks = 0
 
     def on_input_phase(self, input_link):
-        print("State:")
-        self.agent.execute_command("print --depth 2 s1")
-        print("Input link:")
-        self.agent.execute_command("print --depth 3 i2")
-        print("Output link:")
-        self.agent.execute_command("print --depth 4 i3")
+        if not self.print_every:
+            return
+        self.ticks += 1
+        if self.ticks < self.print_every:
+            return
+        self.ticks = 0
+        # If the worker is still behind, skip walking working memory for a snapshot that would
+        #   only be dropped
+        if self.print_queue.full():
+            return
+
+        sml_agent = self.agent.agent
+        snapshot = "State:\n{}\nInput link:\n{}\nOutput link:\n{}".format(
+            sml_agent.ExecuteCommandLine(self.STATE_CMD),
+            sml_agent.ExecuteCommandLine(self.INPUT_LINK_CMD),
+            sml_agent.ExecuteCommandLine(self.OUTPUT_LINK_CMD)
+        )
+        try:
+            self.print_queue.put_nowait(snapshot)
+        except queue.Full:
+            pass
+        if self.print_thread is None:
+            self.print_thread = threading.Thread(target=self.__print_worker, daemon=True)
+            self.print_thread.start()
 
 
-def define_custom_objects_from_file(world: cozmo.world.World, filename: str):
-    obj_tree = ET.parse(filename)
-    obj_root = obj_tree.getroot()
-    custom_objects = []
+# The description of a custom object read from an object file. `size` is only set for cubes, and
+#   `width` and `height` only for walls
+CustomObjectSpec = namedtuple(
+    "CustomObjectSpec",
+    ["type", "name", "unique", "marker", "marker_width", "marker_height", "size", "width",
+     "height"],
+    defaults=(None, None, None)
+)
+
+
+@lru_cache(maxsize=8)
+def parse_custom_objects(filename: str, mtime: float):
+    """
+    Read the custom cubes and walls described in an object file.
+
+    Parsing has no side effects, so its result is cached. The file's modification time is part of
+    the cache key, so editing the file causes it to be read again.
+
+    :param filename: Path of the XML object file
+    :param mtime: Modification time of the file, as returned by `os.path.getmtime`
+    :return: A tuple of `CustomObjectSpec`s, in file order
+    """
+    obj_root = ET.parse(filename).getroot()
+    specs = []
     for obj_node in obj_root:
         obj_type = obj_node.tag
-        obj_unique = True if obj_node.attrib['unique'] == "true" else False
-        obj_name = obj_node.find('name').text
-        obj_marker_node = obj_node.find('marker')
-        obj_marker = obj_marker_node.text
-        obj_marker_height = int(obj_marker_node.attrib['height'])
-        obj_marker_width = int(obj_marker_node.attrib['width'])
-        cozmo_object_type = custom_object_type_factory(obj_type, obj_name)
+        # Read every child element in one pass, rather than scanning the children again for each
+        #   field with `find`. Like `find`, the first child with a given tag wins
+        obj_fields = {}
+        for field_node in obj_node:
+            obj_fields.setdefault(field_node.tag, field_node)
+        obj_marker_node = obj_fields['marker']
+        obj_info = dict(
+            type=obj_type,
+            name=obj_fields['name'].text,
+            unique=obj_node.attrib['unique'] == "true",
+            marker=obj_marker_node.text,
+            marker_width=int(obj_marker_node.attrib['width']),
+            marker_height=int(obj_marker_node.attrib['height']),
+        )
         if obj_type == "cube":
-            obj_size = int(obj_node.find('size').text)
+            specs.append(CustomObjectSpec(size=int(obj_fields['size'].text), **obj_info))
+        if obj_type == "wall":
+            specs.append(CustomObjectSpec(width=int(obj_fields['width'].text),
+                                          height=int(obj_fields['height'].text), **obj_info))
+    return tuple(specs)
+
+
+def define_custom_objects_from_file(world: cozmo.world.World, filename: str):
+    custom_objects = []
+    for spec in parse_custom_objects(filename, os.path.getmtime(filename)):
+        cozmo_object_type = custom_object_type_factory(spec.type, spec.name)
+        if spec.type == "cube":
             custom_object = world.define_custom_cube(
                 custom_object_type=cozmo_object_type,
-                marker=MARKER_DICT[obj_marker],
-                size_mm=obj_size,
-                marker_width_mm=obj_marker_width,
-                marker_height_mm=obj_marker_height,
-                is_unique=obj_unique)
+                marker=MARKER_DICT[spec.marker],
+                size_mm=spec.size,
+                marker_width_mm=spec.marker_width,
+                marker_height_mm=spec.marker_height,
+                is_unique=spec.unique)
             custom_objects.append(custom_object)
-        if obj_type == "wall":
-            obj_width = int(obj_node.find('width').text)
-            obj_height = int(obj_node.find('height').text)
+        if spec.type == "wall":
             custom_object = world.define_custom_wall(
                 custom_object_type=cozmo_object_type,
-                marker=MARKER_DICT[obj_marker],
-                width_mm=obj_width,
-                height_mm=obj_height,
-                marker_width_mm=obj_marker_width,
-                marker_height_mm=obj_marker_height,
-                is_unique=obj_unique)
-            custom_object.name = obj_name
+                marker=MARKER_DICT[spec.marker],
+                width_mm=spec.width,
+                height_mm=spec.height,
+                marker_width_mm=spec.marker_width,
+                marker_height_mm=spec.marker_height,
+                is_unique=spec.unique)
+            custom_object.name = spec.name
             custom_objects.append(custom_object)
     return custom_objects
@@ -1,3 +1,4 @@
+import logging
 from time import sleep
 from argparse import ArgumentParser
 from pathlib import Path
@@ -7,7 +8,7 @@ import cozmo
 from cozmo_soar import CozmoSoar
 import PySoarLib as psl
 
-from c_soar_util import *
+from c_soar_util import COZMO_COMMANDS, GREEN_STR, RESET_STR
 
 
 def cse_factory(agent_file: Path, auto_run=False, object_file=None, debugger=False):
@@ -66,6 +67,14 @@ def gen_cli_parser():
         action="store_true"
     )
 
+    cli_parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        help="If present, log each command the interface carries out.",
+        action="store_true"
+    )
+
     cli_parser.add_argument(
         "--3d-view",
         dest="debugger",
@@ -79,6 +88,11 @@ def gen_cli_parser():
 if __name__ == "__main__":
     cli_parser = gen_cli_parser()
     args = cli_parser.parse_args()
+    # Only the interface's own logger is configured, so other libraries' logging is left alone
+    cozmo_soar_log = logging.getLogger("cozmo_soar")
+    cozmo_soar_log.addHandler(logging.StreamHandler())
+    cozmo_soar_log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    cozmo_soar_log.propagate = False
     agent_file_path = Path(args.agent)
     if not agent_file_path.is_file():
         raise FileNotFoundError("ERROR: Agent file doesn't exist!")